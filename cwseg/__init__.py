@@ -0,0 +1,5 @@
+"""
+Chinese word segmenter and lexicon builder.  The package is split into the
+charset, lexicon, segment and builder modules so that each program only
+imports what it uses.
+"""
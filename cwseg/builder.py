@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+HTML parser for lexicon building
+"""
+from HTMLParser import HTMLParser
+from cwseg.charset import is_chinese
+from cwseg.lexicon import add_word
+
+def parse_chinese(data, lex_dict, maxlen, verbose):
+    """Search for Chinese words based on string length, punctuation, and language"""
+    d = data.decode('utf-8', errors='ignore')
+    l = len(d) 
+    word = ''
+
+    for c in d:
+        if is_chinese(c):
+            word += c
+        else:
+            if len(word) > 0 and len(word) <= maxlen:
+                if verbose:
+                    print 'Adding word:', word 
+                add_word(word, 0, lex_dict)
+                word = ''
+    if len(word) > 0 and len(word) <= maxlen:
+        if verbose:
+            print 'Adding word:', word 
+        add_word(word, 0, lex_dict)
+
+class parse_html(HTMLParser):
+    def __init__(self, lex_dict, maxlen, verbose):
+        self.lex_dict = lex_dict
+        self.maxlen = maxlen
+        self.verbose = verbose 
+        HTMLParser.__init__(self) 
+    #def handle_starttag(self, tag, attrs):
+    #    print "Encountered a start tag:", tag
+    #def handle_endtag(self, tag):
+    #    print "Encountered an end tag:", tag
+    def handle_data(self, data):
+        parse_chinese(data, self.lex_dict, self.maxlen, self.verbose)
+
+def build_lexicon(filename, lex_dict, maxlen, verbose):
+    """Parse the input file for Chinese characters and save them to a 
+       dictionary"""
+    parser = parse_html(lex_dict, maxlen, verbose)
+    charset_regexp = '\s+charset=(utf-8)'
+
+    f = open(filename, 'rU')
+    text = f.read()
+
+    # Make sure we have UTF-8
+    #charset_match = re.search(charset_regexp, text, re.IGNORECASE)
+    #if not charset_match:
+    #    sys.stderr.write('Character set not supported\n')
+    #    sys.exit(1)
+
+    #E4 B8 AD
+    #unicode(u'中')
+    #d = u'中' 
+    #parser.feed(text)
+    try:
+        parser.feed(text)
+    except UnicodeDecodeError:
+        f.close()
+        return 
+    f.close()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Character classes used by the lexicon builder and the word segmenter
+"""
+def is_chinese(c):
+    """Check the Unicode character value"""
+    v = ord(c)
+    if ((v >= 0x4e00  and v <= 0x9fff) or  # common
+        (v >= 0x3400  and v <= 0x4dff) or  # rare 
+        (v >= 0x20000 and v <= 0x2a6df)):  # rare, historic 
+        return 1
+    return 0
+
+def is_chinese_string(s):
+    i = j = 0
+    slen = len(s)
+    while (i < slen):
+        if is_chinese(s[i]):
+            j += 1
+        i += 1
+    if j == slen:
+        return 1;
+    return 0
+
+def is_latin(c):
+    v = ord(c)
+    if ((v >= 0x0000 and v <= 0x00ff) or 
+       (v >= 0xff00 and v <= 0xffef)):  # full width Latin 
+        return 1
+    return 0
+
+def is_number(c):
+    v = ord(c)
+    if (v == 0x25cb or  # ○
+        v == 0x4e00 or  # 一
+        v == 0x4e8c or  # 二
+        v == 0x4e09 or  # 三
+        v == 0x56db or  # 四
+        v == 0x4e94 or  # 五
+        v == 0x516d or  # 六
+        v == 0x4e03 or  # 七
+        v == 0x516b or  # 八
+        v == 0x4e45 or  # 久
+        v == 0x5341 or  # 十
+        v == 0x5eff or  # 廿
+        v == 0x5345 or  # 卅 
+        v == 0x767e or  # 百
+        v == 0x5343 or  # 千
+        v == 0x842c or  # 萬 
+        v == 0x4e07):   # 万 
+        return 1
+    return 0
+
+def is_circle(c):
+    v = ord(c)
+    if v == 0x25cb:
+        return 1
+    return 0
+
+def is_space(c):
+    v = ord(c)
+    if v == 0x0020 or v == 0x3000:  
+        return 1
+    return 0
+
+def is_percent(c):
+    v = ord(c)
+    if v == 0x0025 or v == 0xff05:  
+        return 1
+    return 0
+
+def is_stop(c):
+    v = ord(c)
+    if v == 0xff0e:  
+        return 1
+    return 0
+
+def is_paren(c):
+    v = ord(c)
+    if v == 0xff08 or v == 0xff09:  # full width paren 
+        return 1
+    return 0
+
+def is_lparen(c):
+    v = ord(c)
+    if v == 0xff08:  # full width paren 
+        return 1
+    return 0
+
+def is_rparen(c):
+    v = ord(c)
+    if v == 0xff09:  # full width paren 
+        return 1
+    return 0
+
+def is_lquote(c):
+    v = ord(c)
+    if v == 0x201c:
+        return 1
+    return 0
+
+def is_rquote(c):
+    v = ord(c)
+    if v == 0x201d:
+        return 1
+    return 0
+
+def is_comma(c):
+    v = ord(c)
+    if v == 0xff0c:  # full width comma
+        return 1
+    return 0
+
+def is_vline(c):
+    v = ord(c)
+    if v == 0x7c:  # vertical line 
+        return 1
+    return 0
+
+def is_colon(c):
+    v = ord(c)
+    # 0xff1a --> full width colon
+    if v == 0x02d0 or v == 0xff1a:  
+        return 1
+    return 0
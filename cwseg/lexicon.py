@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Lexicon dictionary storage, statistics and maintenance
+"""
+import os
+import sys
+
+def read_dict(filename):
+    """Load the lexicon dictionary"""
+    import cPickle as pickle
+    return pickle.load(open(filename, 'rb'))
+
+def write_pickle(obj, filename, protocol):
+    """Pickle an object to a temporary file which is then renamed, so that a 
+       reader never sees a partially written file"""
+    import cPickle as pickle
+    tmpname = filename + '.tmp'
+    f = open(tmpname, 'wb')
+    pickle.dump(obj, f, protocol)
+    f.close()
+    os.rename(tmpname, filename)
+
+def write_dict(lex_dict, filename, protocol=0):
+    """Write the lexicon dictionary to disk along with its summary.  The 
+       summary records the size and modification time of the dictionary file 
+       it was made from."""
+    write_pickle(lex_dict, filename, protocol)
+    summary = summarize_dict(lex_dict)
+    summary['stamp'] = file_stamp(filename)
+    write_pickle(summary, summary_name(filename), 2)
+
+def file_stamp(filename):
+    st = os.stat(filename)
+    return (st.st_size, st.st_mtime)
+
+def summary_name(filename):
+    """Name of the summary file kept next to a lexicon dictionary"""
+    return filename + '.info'
+
+def summarize_dict(lex_dict):
+    """Count the words of each length in the lexicon dictionary and find the 
+       longest word"""
+    lengths = {}
+    max_len = 0
+    word = ''
+    for key in lex_dict:
+        lengths[len(key)] = lengths.get(len(key), 0) + 1
+        if len(key) > max_len:
+            max_len = len(key)
+            word = key 
+    return {'nwords' : len(lex_dict), 'lengths' : lengths,
+            'max_len' : max_len, 'word' : word}
+
+def read_summary(filename):
+    """Load the summary of a lexicon dictionary without loading the dictionary 
+       itself.  Returns None if there is no summary or it was not made from 
+       the dictionary file as it is now."""
+    import cPickle as pickle
+    sname = summary_name(filename)
+    if not os.path.exists(sname):
+        return None
+    summary = pickle.load(open(sname, 'rb'))
+    if summary.get('stamp') != file_stamp(filename):
+        return None
+    return summary
+
+def dump_dict(lex_dict):
+    """Dump the lexicon dictionary"""
+    for key, value in lex_dict.iteritems():
+        print >>sys.stderr, key, value 
+
+def info_dict(summary):
+    """Show lexicon dictionary statistical information"""
+    nwords = summary['nwords']
+    print 'Total words:', nwords
+    for n in range(1, 5):
+        lwords = summary['lengths'].get(n, 0)
+        if lwords > 0:
+            print '%d character words:' % n, lwords,
+            print ', % of dictionary:', format(float(lwords)/float(nwords)*100, '.2f')
+    print 'Longest word length:', summary['max_len']
+    print 'Longest word:', summary['word']
+
+def prune_dict(t, lex_dict, filename, verbose):
+    """Prune the lexicon dictionary of characters with frequency less than or 
+       equal to the threshold t"""
+    for char in lex_dict.keys():
+        freq = lex_dict[char]['freq']
+        if freq <= t:
+            if verbose:
+                print 'Removing %s from the dictionary' % char
+            del lex_dict[char]
+    write_dict(lex_dict, filename)
+
+def can_match(word, entry, freq_threshold):
+    """Check whether a lexicon entry can ever be matched by maximum_match at 
+       the given frequency threshold"""
+    if entry['dict'] or entry['freq'] > freq_threshold:
+        return 1
+    # Frequent words are also matched, except for two character words
+    if entry['freq'] > 10 and len(word) != 2:
+        return 1
+    return 0
+
+def compact_dict(lex_dict, freq_threshold, topk):
+    """Return a copy of the lexicon dictionary containing only the entries 
+       that can be matched at the given frequency threshold.  If topk is set 
+       only the topk most frequent words of each length are kept, along with 
+       every dictionary word.  Identical entries share a single value so the 
+       result must be treated as read-only."""
+    values = {}
+    by_len = {}
+    compact = {}
+    for word, entry in lex_dict.iteritems():
+        if not can_match(word, entry, freq_threshold):
+            continue
+        if entry['dict'] or not topk:
+            compact[word] = entry
+        else:
+            by_len.setdefault(len(word), []).append((-entry['freq'], word))
+    for words in by_len.itervalues():
+        words.sort()
+        for freq, word in words[:topk]:
+            compact[word] = lex_dict[word]
+    for word, entry in compact.iteritems():
+        key = (entry['freq'], entry['dict'])
+        if key not in values:
+            values[key] = {'freq' : entry['freq'], 'dict' : entry['dict']}
+        compact[word] = values[key]
+    return compact
+
+def export_dict(lex_dict, filename, outname, freq_threshold, topk, checkname, 
+                verbose):
+    """Export a compact, read-only segmentation lexicon from the dictionary 
+       loaded from filename.  If checkname is set the file is segmented with 
+       both lexicons and any lines that differ are reported."""
+    compact = compact_dict(lex_dict, freq_threshold, topk)
+    write_dict(compact, outname, 2)
+
+    nwords = len(lex_dict)
+    nbytes = os.path.getsize(filename)
+    cbytes = os.path.getsize(outname)
+    print 'Words:', nwords, '->', len(compact),
+    print ', % removed:', format(float(nwords - len(compact))/max(nwords, 1)*100, '.2f')
+    print 'Bytes:', nbytes, '->', cbytes,
+    print ', % removed:', format(float(nbytes - cbytes)/max(nbytes, 1)*100, '.2f')
+
+    if checkname:
+        from cwseg.segment import maximum_match_spans
+        maxlen = max_word_len(lex_dict)
+        nlines = ndiffs = 0
+        f = open(checkname, 'rU')
+        for line in f:
+            nlines += 1
+            input = line.decode('utf-8')
+            spans = maximum_match_spans(input, freq_threshold, lex_dict, maxlen)
+            if maximum_match_spans(input, freq_threshold, compact, maxlen) != spans:
+                ndiffs += 1
+                if verbose:
+                    print 'Segmentation differs on line', nlines
+        f.close()
+        print 'Lines checked:', nlines, ', lines differing:', ndiffs
+
+def add_word(word, is_dict, lex_dict):
+    """Add a word to the lexicon dictionary or update the frequency"""
+    if word not in lex_dict:
+        if is_dict:
+            lex_dict[word] = {'freq' : 0, 'dict' : 1}
+        else:
+            lex_dict[word] = {'freq' : 1, 'dict' : 0}
+    else:
+        if not is_dict:
+            lex_dict[word]['freq'] += 1
+
+def merge_dict(lex_dict, other):
+    """Merge another lexicon dictionary into the lexicon dictionary, adding up 
+       the word frequencies"""
+    for word, entry in other.iteritems():
+        if word not in lex_dict:
+            lex_dict[word] = {'freq' : entry['freq'], 'dict' : entry['dict']}
+        else:
+            lex_dict[word]['freq'] += entry['freq']
+            lex_dict[word]['dict'] = lex_dict[word]['dict'] or entry['dict']
+
+def in_dict(word, freq_threshold, lex_dict):
+    if word in lex_dict:
+        if lex_dict[word]['dict']:
+            return 1
+        elif lex_dict[word]['freq'] > freq_threshold:
+            return 1
+    return 0
+
+def max_word_len(lex_dict):
+    """Return the length of the longest word in the lexicon dictionary"""
+    max_len = 0
+    for key in lex_dict:
+        if len(key) > max_len:
+            max_len = len(key)
+    return max_len
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Maximum matching word segmentation
+"""
+import sys
+from array import array
+from cwseg.charset import is_chinese, is_latin, is_number, is_circle, \
+    is_percent, is_stop, is_paren, is_comma
+from cwseg.lexicon import in_dict, max_word_len
+
+def trim_spans(spans, input):
+    """Drop whitespace tokens from the end of a flat array of span offsets"""
+    while len(spans) and input[spans[-2]].isspace():
+        spans.pop()
+        spans.pop()
+
+def add_span(spans, input, start, end, glue):
+    """Add the token input[start:end] to a flat array of (start, end) offsets.  
+       A token of whitespace alone is added as it is, any other token is split 
+       at whitespace and the whitespace is dropped.  A glued token is joined 
+       on to the previous token along with the whitespace in between, which 
+       join_spans leaves out."""
+    if input[start:end].isspace():
+        spans.append(start)
+        spans.append(end)
+        return
+    if glue:
+        trim_spans(spans, input)
+    i = start
+    while i < end:
+        if input[i].isspace():
+            i += 1
+            continue
+        j = i + 1
+        while j < end and not input[j].isspace():
+            j += 1
+        if glue and len(spans):
+            spans[-1] = j
+        else:
+            spans.append(i)
+            spans.append(j)
+        glue = 0
+        i = j
+
+def join_spans(input, spans, space):
+    """Join the tokens given by an array of span offsets into a string.  The 
+       whitespace a glued token took in is left out of the token."""
+    words = []
+    for k in xrange(0, len(spans), 2):
+        word = input[spans[k]:spans[k+1]]
+        words.append(u''.join(word.split()) or word)
+    return space.join(words)
+
+def maximum_match_spans(input, freq_threshold, lex_dict, maxlen=None):
+    """Given a decoded line of text, segment based on the longest length word 
+       found in the dictionary.  The tokens are returned as an array of 
+       (start, end) offsets into the line, flattened so that token k spans 
+       input[spans[2*k]:spans[2*k+1]].  Words longer than maxlen are not 
+       looked up."""
+    input_len = len(input) 
+    spans = array('I')
+    prev_c = ''
+
+    if maxlen is None:
+        maxlen = input_len
+
+    # No space between numbers, decimal point
+    # No space between year/month character following numbers
+    i = 0
+    while i < input_len:
+        if is_chinese(input[i]): 
+            glue = 0
+            if len(prev_c) and is_stop(prev_c):
+                glue = 1
+                prev_c = ''
+
+            if len(prev_c) and (is_number(prev_c) and is_number(input[i])):
+                glue = 1
+                j = i + 1
+            else:
+                # Find the longest match starting from the end
+                j = min(input_len, i + maxlen)
+                while j > i + 1:
+                    word = input[i:j]
+                    if in_dict(word, freq_threshold, lex_dict):
+                        break
+                    elif word in lex_dict and lex_dict[word]['freq'] > 10:
+                        if len(word) == 2:
+                            if ((lex_dict[word[0]]['dict'] and lex_dict[word[1]]['dict']) and
+                                (lex_dict[word[0]]['freq'] > lex_dict[word]['freq']) and
+                                (lex_dict[word[1]]['freq'] > lex_dict[word]['freq'])):
+                                j -= 1
+                                continue
+                        else:
+                            break
+
+                    j -= 1
+            add_span(spans, input, i, j, glue)
+            prev_c = input[j-1]
+            i = j
+        else:
+            if is_latin(input[i]):
+                # Split the run of Latin characters before stops, commas, 
+                # parens and after percent signs, a percent sign is joined on 
+                # to the number before it
+                start = i
+                glue = is_stop(input[i]) or is_percent(input[i])
+                prev_c = ''
+                while i < input_len and is_latin(input[i]):
+                    if i > start:
+                        if (is_percent(prev_c) or is_paren(prev_c) or is_paren(input[i]) or
+                            is_stop(input[i]) or is_comma(input[i])):
+                            add_span(spans, input, start, i, glue)
+                            glue = 0
+                            start = i
+                        elif is_percent(input[i]):
+                            add_span(spans, input, start, i, glue)
+                            glue = 1
+                            start = i
+                    prev_c = input[i]
+                    i += 1
+                add_span(spans, input, start, i, glue)
+            else:
+                add_span(spans, input, i, i + 1, is_circle(input[i]))
+                i += 1
+    trim_spans(spans, input)
+    return spans
+
+def maximum_match(line, space, freq_threshold, lex_dict, maxlen=None):
+    """Given a line of text, segment based on the longest length word found in 
+       the dictionary"""
+    input = line.decode('utf-8')
+    spans = maximum_match_spans(input, freq_threshold, lex_dict, maxlen)
+    return join_spans(input, spans, space)
+
+def simple_maximum_match_spans(input, freq_threshold, lex_dict, maxlen=None):
+    """Given a decoded line of text, segment based on the longest length word 
+       found in the dictionary, without any of the heuristics used by 
+       maximum_match_spans.  The tokens are returned as a flat array of 
+       (start, end) offsets into the line."""
+    input_len = len(input) 
+    spans = array('I')
+
+    if maxlen is None:
+        maxlen = input_len
+
+    i = 0
+    while i < input_len:
+        if is_chinese(input[i]): 
+            # Find the longest match starting from the end
+            j = min(input_len, i + maxlen)
+            while j > i + 1:
+                if in_dict(input[i:j], freq_threshold, lex_dict):
+                    break
+                j -= 1
+            add_span(spans, input, i, j, 0)
+            i = j
+        else:
+            if is_latin(input[i]):
+                start = i
+                while i < input_len and is_latin(input[i]):
+                    i += 1
+                add_span(spans, input, start, i, 0)
+            else:
+                add_span(spans, input, i, i + 1, 0)
+                i += 1
+    trim_spans(spans, input)
+    return spans
+
+def simple_maximum_match(line, space, freq_threshold, lex_dict, maxlen=None):
+    """Given a line of text, segment based on the longest length word found in 
+       the dictionary"""
+    input = line.decode('utf-8')
+    spans = simple_maximum_match_spans(input, freq_threshold, lex_dict, maxlen)
+    return join_spans(input, spans, space)
+
+def word_segmenter(filename, space, freq_threshold, lex_dict, verbose, 
+                   bfilename=None):
+    """Segment the text by using maximum matching.  If bfilename is given the 
+       token spans are written to it instead of printing the text.  Each line 
+       is written as an unsigned int count of tokens followed by the start 
+       and end offset of each token, all in native byte order."""
+    maxlen = max_word_len(lex_dict)
+    f = open(filename, 'rU')
+    if bfilename:
+        bf = open(bfilename, 'wb')
+
+    for line in f:
+        input = line.decode('utf-8')
+        spans = maximum_match_spans(input, freq_threshold, lex_dict, maxlen)
+        if bfilename:
+            array('I', [len(spans)/2]).tofile(bf)
+            spans.tofile(bf)
+        else:
+            print >>sys.stderr, join_spans(input, spans, space)
+        #print >>sys.stderr, simple_maximum_match(line, space, freq_threshold, lex_dict)
+
+    if bfilename:
+        bf.close()
+    f.close()
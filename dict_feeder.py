@@ -1,27 +1,27 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 """
-Dictionary feeder for lexicon building.  Given a dictionary file of 
-Chinese characters encoded in UTF-8, add each word definition to the 
-lexicon dictionary.  Note that the lexicon building program (segmenter.py) 
-must be in the same directory as this script.
+Dictionary feeder for lexicon building.  Given dictionary files of Chinese 
+characters encoded in UTF-8, add each word definition to the lexicon 
+dictionary.  Entries in the CEDICT format contribute their traditional and 
+simplified headwords, other lines are split on spaces, commas and vertical 
+lines.  Note that the cwseg package must be in the same directory as this 
+script.
 """
 import os
 import sys
 import signal
 import argparse
-from segmenter import is_chinese, is_space, is_comma, is_vline, add_word, read_dict, write_dict
-
-nwords = 0
+from cwseg.charset import is_chinese, is_chinese_string, is_space, is_comma, is_vline
+from cwseg.lexicon import read_dict, write_dict
 
 def signal_handler(signal, frame):
     sys.exit(0)
 
-def parse_line(data, lex_dict):
-    global nwords
-
-    d = data.decode('utf-8', errors='ignore')
-    l = len(d)
+def parse_line(d):
+    """Return the words of a line separated by spaces, commas or vertical 
+       lines"""
+    words = []
     word = ''
 
     for c in d:
@@ -29,24 +29,63 @@ def parse_line(data, lex_dict):
             word += c
         elif is_space(c) or is_comma(c) or is_vline(c) or c == '\n':
             if len(word) > 0:
-                add_word(word, 1, lex_dict)
-                nwords += 1
+                words.append(word)
                 word = ''
+    return words
+
+def parse_cedict_line(d):
+    """Return the headwords of a CEDICT entry, e.g. 
+       '傳統 传统 [chuan2 tong3] /tradition/', or None if the line is not in 
+       the CEDICT format"""
+    fields = d.split(' ', 2)
+    if len(fields) < 3 or not fields[2].startswith('['):
+        return None
+    return fields[:2]
+
+def read_words(filename):
+    """Return the words defined in a dictionary file"""
+    words = []
+
+    f = open(filename, 'rU')
+    for line in f:
+        if line.startswith('#'):
+            continue
+        d = line.decode('utf-8', errors='ignore')
+        headwords = parse_cedict_line(d)
+        if headwords is None:
+            words.extend(parse_line(d))
+        else:
+            for word in set(headwords):
+                if word and is_chinese_string(word):
+                    words.append(word)
+    f.close()
+    return words
+
+def merge_words(words, lex_dict):
+    """Add dictionary words to the lexicon dictionary, returning the number of 
+       new entries"""
+    nnew = 0
+    for word in set(words):
+        if word not in lex_dict:
+            lex_dict[word] = {'freq' : 0, 'dict' : 1}
+            nnew += 1
+    return nnew
 
 def main():
     lex_dict = {}
     dictname = 'lex_dict.p'
 
     parser = argparse.ArgumentParser(description='Dictionary feeder for lexicon building')
-    parser.add_argument('-d', '--dict', action='store', dest='dfilename',
-                        help="dictionary input file, e.g. 'cedict_ts.u8'")
+    parser.add_argument('-d', '--dict', action='append', dest='dfilenames',
+                        help="dictionary input file, e.g. 'cedict_ts.u8', may \
+                        be given more than once")
     parser.add_argument('-l', '--lexdict', action='store', dest='lfilename',
                         help="lexicon dictionary file")
     parser.add_argument('-v', '--verbose', action='store_true', dest='verbose',
                         help="enable verbose mode")
 
     args = parser.parse_args()
-    dfilename = args.dfilename
+    dfilenames = args.dfilenames or []
     lfilename = args.lfilename
     verbose = args.verbose
 
@@ -62,10 +101,14 @@ def main():
         if verbose:
             print 'done.'
 
-    f = open(dfilename, 'rU')
-    for line in f:
-        parse_line(line, lex_dict)
-    f.close
+    words = []
+    for dfilename in dfilenames:
+        if verbose:
+            print 'Reading dictionary \'%s\' ...' % dfilename,
+        words.extend(read_words(dfilename))
+        if verbose:
+            print 'done.'
+    nnew = merge_words(words, lex_dict)
 
     if verbose:
         print 'Writing lexicon dictionary to \'%s\' ...' % dictname,
@@ -74,7 +117,8 @@ def main():
         print 'done.'
 
     if verbose:
-        print "words processed:", nwords
+        print "words processed:", len(words)
+        print "words added:", nnew
 
 if __name__ == '__main__':
     sys.exit(main())
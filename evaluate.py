@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Segmentation evaluator.  Given a gold standard corpus of UTF-8 encoded text
+with words separated by whitespace, as in the SIGHAN bakeoff, segment the
+unspaced text and compare the result against the gold standard.  Precision,
+recall, F1 and out of vocabulary (OOV) recall are reported for each
+segmentation engine and frequency threshold along with the throughput in
+characters per second.  Note that the cwseg package must be in the same
+directory as this script.
+"""
+import sys
+import time
+import signal
+import argparse
+from cwseg.lexicon import in_dict, read_dict, max_word_len
+from cwseg.segment import maximum_match_spans, simple_maximum_match_spans
+
+engines = {'mm' : maximum_match_spans, 'smm' : simple_maximum_match_spans}
+
+def signal_handler(signal, frame):
+    sys.exit(0)
+
+def read_gold(filename):
+    """Read a gold standard corpus, returning a list of (text, words, spans)
+       tuples where spans is the set of (start, end) offsets of the words"""
+    gold = []
+    f = open(filename, 'rU')
+    for line in f:
+        words = line.decode('utf-8').split()
+        spans = set()
+        i = 0
+        for word in words:
+            spans.add((i, i + len(word)))
+            i += len(word)
+        gold.append((u''.join(words), words, spans))
+    f.close()
+    return gold
+
+def read_vocab(filename):
+    """Read the vocabulary of a segmented training corpus"""
+    vocab = set()
+    f = open(filename, 'rU')
+    for line in f:
+        vocab.update(line.decode('utf-8').split())
+    f.close()
+    return vocab
+
+def evaluate(gold, segment, freq_threshold, lex_dict, vocab):
+    """Segment the gold standard text and score it, returning a tuple of
+       (precision, recall, F1, OOV recall, characters per second).  The OOV
+       recall is None if the gold standard has no OOV words."""
+    maxlen = max_word_len(lex_dict)
+    nchars = ngold = ntest = ncorrect = noov = noov_correct = 0
+    elapsed = 0.0
+
+    for text, words, gold_spans in gold:
+        start = time.time()
+        spans = segment(text, freq_threshold, lex_dict, maxlen)
+        elapsed += time.time() - start
+
+        test_spans = set()
+        for k in xrange(0, len(spans), 2):
+            test_spans.add((spans[k], spans[k+1]))
+        nchars += len(text)
+        ngold += len(gold_spans)
+        ntest += len(test_spans)
+        ncorrect += len(gold_spans & test_spans)
+
+        i = 0
+        for word in words:
+            if vocab is not None:
+                oov = word not in vocab
+            else:
+                oov = not in_dict(word, freq_threshold, lex_dict)
+            if oov:
+                noov += 1
+                if (i, i + len(word)) in test_spans:
+                    noov_correct += 1
+            i += len(word)
+
+    p = float(ncorrect)/max(ntest, 1)
+    r = float(ncorrect)/max(ngold, 1)
+    f1 = 2*p*r/(p + r) if p + r > 0 else 0.0
+    oov_r = float(noov_correct)/noov if noov > 0 else None
+    cps = nchars/elapsed if elapsed > 0 else 0.0
+    return p, r, f1, oov_r, cps
+
+def main():
+    dictname = 'lex_dict.p'
+
+    parser = argparse.ArgumentParser(description='Segmentation evaluator')
+    parser.add_argument('-e', '--engine', action='append', dest='engines',
+                        choices=sorted(engines.keys()),
+                        help="segmentation engine, maximum matching (mm) or \
+                        simple maximum matching (smm), may be given more than \
+                        once (default: mm)")
+    parser.add_argument('-f', '--freq', action='append', dest='freq_thresholds',
+                        type=int,
+                        help="minimum dictionary word frequency threshold, may \
+                        be given more than once (default: 1)")
+    parser.add_argument('-g', '--gold', action='store', dest='gfilename',
+                        required=True,
+                        help="gold standard segmented corpus")
+    parser.add_argument('-l', '--lexdict', action='store', dest='lfilename',
+                        help="lexicon dictionary file")
+    parser.add_argument('-t', '--training', action='store', dest='tfilename',
+                        help="segmented training corpus used to decide which \
+                        words are OOV (default: words not in the lexicon \
+                        dictionary)")
+    parser.add_argument('-v', '--verbose', action='store_true', dest='verbose',
+                        help="enable verbose mode")
+
+    args = parser.parse_args()
+    names = args.engines or ['mm']
+    freq_thresholds = args.freq_thresholds or [1]
+    gfilename = args.gfilename
+    lfilename = args.lfilename
+    tfilename = args.tfilename
+    verbose = args.verbose
+
+    signal.signal(signal.SIGINT, signal_handler)
+
+    if lfilename:
+        dictname = lfilename
+
+    if verbose:
+        print 'Reading lexicon dictionary \'%s\' ...' % dictname,
+    start = time.time()
+    lex_dict = read_dict(dictname)
+    load_time = time.time() - start
+    if verbose:
+        print 'done.'
+
+    gold = read_gold(gfilename)
+    vocab = None
+    if tfilename:
+        vocab = read_vocab(tfilename)
+
+    print 'Lexicon load time:', format(load_time, '.2f'), 's'
+    print 'Gold standard lines:', len(gold)
+    print '%-6s %9s %7s %7s %7s %7s %11s' % ('engine', 'threshold', 'P', 'R',
+                                             'F1', 'OOV-R', 'chars/sec')
+    for name in names:
+        for freq_threshold in freq_thresholds:
+            if verbose:
+                print 'Evaluating %s with threshold %d ...' % (name, freq_threshold)
+            p, r, f1, oov_r, cps = evaluate(gold, engines[name], freq_threshold,
+                                            lex_dict, vocab)
+            if oov_r is None:
+                oov_r = '    n/a'
+            else:
+                oov_r = format(oov_r, '7.4f')
+            print '%-6s %9d %7.4f %7.4f %7.4f %s %11.0f' % (name,
+                freq_threshold, p, r, f1, oov_r, cps)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,20 +3,30 @@
 """
 HTML feeder for lexicon building.  Given a top level directory of HTML files 
 this program will recurse down each directory feeding HTML files to the lexicon 
-builder.  Note that the lexicon building program (segmenter.py) must be in the 
-same directory as this script.
+builder.  Note that the cwseg package must be in the same directory as this 
+script.
 """
 import os
 import sys
+import stat
+import time
+import Queue
 import signal
 import smtplib
 import argparse
 import datetime
+import threading
 from os.path import join, getsize
 from email.MIMEText import MIMEText
 from email.MIMEMultipart import MIMEMultipart
 from email.Utils import COMMASPACE, formatdate
-from segmenter import build_lexicon, read_dict, write_dict
+from cwseg.builder import build_lexicon
+from cwseg.lexicon import read_dict, write_dict, merge_dict
+
+try:
+    from scandir import scandir
+except ImportError:
+    scandir = None
 
 def signal_handler(signal, frame):
     sys.exit(0)
@@ -27,6 +37,95 @@ def escape_chars(s):
         s = s.replace(c, '\\' + c)
     return s 
 
+def is_html(name):
+    return name.endswith('.html') or name.endswith('.htm')
+
+def list_dir(dirname):
+    """List a directory, returning its subdirectories and the (path, size) of 
+       each HTML file.  The scandir module is used when available so that the 
+       file type comes from the directory entry itself."""
+    dirs = []
+    files = []
+    if scandir is not None:
+        for entry in scandir(dirname):
+            if entry.is_dir(follow_symlinks=False):
+                dirs.append(entry.path)
+            elif is_html(entry.name) and entry.is_file():
+                files.append((entry.path, entry.stat().st_size))
+    else:
+        for name in os.listdir(dirname):
+            path = join(dirname, name)
+            st = os.lstat(path)
+            if stat.S_ISDIR(st.st_mode):
+                dirs.append(path)
+            elif is_html(name):
+                # Only a symlink needs a second stat, of the file it points to
+                if stat.S_ISLNK(st.st_mode) and os.path.exists(path):
+                    st = os.stat(path)
+                if stat.S_ISREG(st.st_mode):
+                    files.append((path, st.st_size))
+    return dirs, files
+
+def scan_dir(dirpath, nthreads):
+    """Enumerate the HTML files below dirpath.  Each thread pulls a directory 
+       off a shared queue, lists it, and queues up its subdirectories so that 
+       the subtrees are walked concurrently.  Returns a sorted list of 
+       (path, size) tuples."""
+    queue = Queue.Queue()
+    found = []
+
+    def worker():
+        while True:
+            dirname = queue.get()
+            try:
+                dirs, files = list_dir(dirname)
+                for d in dirs:
+                    queue.put(d)
+                found.extend(files)
+            except OSError, e:
+                print >>sys.stderr, 'Unable to scan %s: %s' % (dirname, e)
+            finally:
+                queue.task_done()
+
+    queue.put(dirpath)
+    for n in range(max(nthreads, 1)):
+        t = threading.Thread(target=worker)
+        t.daemon = True
+        t.start()
+    # Queue.join() cannot be interrupted, so poll to let signals through
+    while queue.unfinished_tasks:
+        time.sleep(0.1)
+
+    found.sort()
+    return found
+
+def read_file_list(filepath):
+    """Read a file list, one path per line.  Sizes are not known until the 
+       file is processed, so (path, None) tuples are returned."""
+    files = []
+    f = open(filepath, 'rU')
+    for line in f:
+        name = line.rstrip()
+        if is_html(name):
+            files.append((name, None))
+    f.close()
+    return files
+
+def write_file_list(files, filepath):
+    """Write a file list in the format read by the -f option"""
+    f = open(filepath, 'w')
+    for name, size in files:
+        f.write(name + '\n')
+    f.close()
+
+def partition(files, part):
+    """Select part 'k/n' of a file list, i.e. every nth file starting with 
+       the kth, so that a list can be divided among several workers"""
+    k, n = [int(x) for x in part.split('/')]
+    if n < 1 or k < 1 or k > n:
+        raise ValueError('invalid partition %s' % part)
+    return files[k-1::n]
+
 def send_mail(nfiles, nbytes, send_to):
     """Send an email notification to a list of recipients"""
     server = 'mail.cs.umn.edu'
@@ -57,14 +156,30 @@ def main():
                          help="send an notification to a user, e.g. \
                          'username@cs.umn.edu'")
     parser.add_argument('-f', '--file', action='store', dest='filepath',
-                        help="parse an HTML file list")
+                        help="parse an HTML file list, lines that do not name \
+                        an HTML file are skipped and not counted in the bytes \
+                        processed")
     parser.add_argument('-m', '--maxlen', action='store', dest='maxlen',
                         type=int, default=2,
                         help="maximum word length parsed (default: 2)")
+    parser.add_argument('-j', '--jobs', action='store', dest='nthreads',
+                        type=int, default=8,
+                        help="number of threads used to scan the directory \
+                        (default: 8)")
     parser.add_argument('-l', '--lexdict', action='store', dest='lfilename',
                         help="lexicon dictionary file")
+    parser.add_argument('-M', '--merge', action='append', dest='mergelist',
+                        help="merge a lexicon dictionary, e.g. one built from a \
+                        part of the file list, into the lexicon dictionary, \
+                        may be given more than once")
+    parser.add_argument('-p', '--part', action='store', dest='part',
+                        help="only parse part k of n of the file list, e.g. \
+                        '2/4'")
     parser.add_argument('-v', '--verbose', action='store_true', dest='verbose',
                         help="enable verbose mode")
+    parser.add_argument('-w', '--write-list', action='store', dest='listpath',
+                        help="write the scanned HTML file list, for use with \
+                        -f, and exit")
 
     args = parser.parse_args()
     dirpath = args.dirpath
@@ -72,12 +187,41 @@ def main():
     maxlen = args.maxlen
     lfilename = args.lfilename
     verbose = args.verbose
+    nthreads = args.nthreads
+    listpath = args.listpath
+    part = args.part
+    mergelist = args.mergelist or []
 
     signal.signal(signal.SIGINT, signal_handler)
 
     if lfilename:
         dictname = lfilename
 
+    files = []
+    if filepath:
+        files = read_file_list(filepath)
+    elif dirpath:
+        if os.path.exists(dirpath):
+            if verbose:
+                print 'Scanning \'%s\' ...' % dirpath,
+            files = scan_dir(dirpath, nthreads)
+            if verbose:
+                print 'done.'
+
+    if listpath:
+        if verbose:
+            print 'Writing file list to \'%s\' ...' % listpath,
+        write_file_list(files, listpath)
+        if verbose:
+            print 'done.'
+        return
+
+    if part:
+        try:
+            files = partition(files, part)
+        except ValueError:
+            parser.error('invalid partition \'%s\', expected k/n' % part)
+
     if os.path.exists(dictname):
         if verbose:
             print 'Reading lexicon dictionary \'%s\' ...' % dictname,
@@ -85,36 +229,25 @@ def main():
         if verbose:
             print 'done.'
 
+    for mname in mergelist:
+        if verbose:
+            print 'Merging lexicon dictionary \'%s\' ...' % mname,
+        merge_dict(lex_dict, read_dict(mname))
+        if verbose:
+            print 'done.'
+
     nbytes = nfiles = 0
-    if filepath:
-        f1 = open(filepath, 'rU')
-        list = f1.readlines()
-        for file in list:
-            file = file.rstrip()
-            size = getsize(file)
-            nbytes += size
-            if verbose:
-                print "processing", file, "of size", size, "bytes"
-            #file = escape_chars(file)
-            if file.endswith('.html') or file.endswith('.htm'):
-                build_lexicon(file, lex_dict, maxlen, 0)
-                nfiles += 1
-        f1.close()
-    elif dirpath:
-        if os.path.exists(dirpath):
-            for root, dirs, files in os.walk(dirpath):
-                for name in files:
-                    if name.endswith('.html') or name.endswith('.htm'):
-                        size = getsize(join(root, name))
-                        nbytes += size
-                        nfiles += 1
-                        fname = join(root, name)
-                        if verbose:
-                            print "processing", fname, "of size", size, "bytes"
-                        #fname = escape_chars(fname)
-                        build_lexicon(fname, lex_dict, maxlen, 0)
-
-    if filepath or dirpath:
+    for fname, size in files:
+        if size is None:
+            size = getsize(fname)
+        nbytes += size
+        nfiles += 1
+        if verbose:
+            print "processing", fname, "of size", size, "bytes"
+        #fname = escape_chars(fname)
+        build_lexicon(fname, lex_dict, maxlen, 0)
+
+    if filepath or dirpath or mergelist:
         if verbose:
             print 'Writing lexicon dictionary to \'%s\' ...' % dictname,
         write_dict(lex_dict, dictname)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+#
+# Check the startup time of segmenter.py against a budget.  The median wall
+# time of importing segmenter and of showing lexicon statistics (-i) is
+# measured over several runs.  Exits with status 1 if either is over budget or
+# fails.
+#
+import os
+import sys
+import time
+import subprocess
+
+if len(sys.argv) != 3:
+    print "Usage: check_startup budget_ms lexdict"
+    sys.exit(1)
+
+budget = float(sys.argv[1])
+lexdict = sys.argv[2]
+topdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+segmenter = os.path.join(topdir, 'segmenter.py')
+nruns = 11
+
+# Output goes to /dev/null, which Python 2 would otherwise encode as ASCII
+env = dict(os.environ, PYTHONIOENCODING='utf-8')
+
+def median_ms(cmd):
+    """Returns the median wall time of the command in ms and the exit status 
+       of the first run that failed, or 0 if every run succeeded."""
+    times = []
+    status = 0
+    devnull = open(os.devnull, 'w')
+    for i in range(nruns):
+        start = time.time()
+        rc = subprocess.call(cmd, stdout=devnull, stderr=devnull, env=env)
+        times.append((time.time() - start)*1000)
+        if rc and not status:
+            status = rc
+    devnull.close()
+    times.sort()
+    return times[nruns/2], status
+
+checks = [('import segmenter',
+           [sys.executable, '-c', 'import sys; sys.path.insert(0, %r); import segmenter' % topdir]),
+          ('segmenter.py -i', [sys.executable, segmenter, '-i', '-l', lexdict])]
+
+over = 0
+for name, cmd in checks:
+    ms, status = median_ms(cmd)
+    if status:
+        result = 'failed (exit %d)' % status
+    elif ms > budget:
+        result = 'over budget'
+    else:
+        result = 'ok'
+    if result != 'ok':
+        over = 1
+    print '%-18s %7.1f ms %s' % (name, ms, result)
+
+sys.exit(over)
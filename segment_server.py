@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Long running word segmenter.  Lines of UTF-8 encoded text are read from
+standard input and each one is written back segmented to standard output.
+The lexicon dictionary file is watched while the segmenter runs.  When the
+lexicon builder writes a new version it is loaded in the background and swapped
+in between two lines, so the segmenter never has to be restarted.  Sending
+SIGUSR1 prints the segmenter statistics, including the lexicon version in use,
+to standard error.  Note that the cwseg package must be in the same directory
+as this script.
+"""
+import os
+import sys
+import time
+import signal
+import argparse
+import threading
+from cwseg.lexicon import read_dict, max_word_len
+from cwseg.segment import maximum_match_spans, join_spans
+
+def signal_handler(signal, frame):
+    sys.exit(0)
+
+class lexicon_watcher(threading.Thread):
+    """Poll the lexicon dictionary file and load it whenever it changes.  The
+       loaded lexicon is published as a single (lex_dict, maxlen, version)
+       tuple so that readers always see a consistent lexicon."""
+    def __init__(self, filename, interval, verbose):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.filename = filename
+        self.interval = interval
+        self.verbose = verbose
+        self.version = 0
+        self.stamp = None
+        self.load_time = 0.0
+        self.loaded_at = None
+        self.current = None
+        self.stop = threading.Event()
+        self.load()
+
+    def file_stamp(self):
+        st = os.stat(self.filename)
+        return (st.st_mtime, st.st_size)
+
+    def load(self):
+        """Load the lexicon dictionary and swap it in"""
+        stamp = self.file_stamp()
+        start = time.time()
+        lex_dict = read_dict(self.filename)
+        maxlen = max_word_len(lex_dict)
+        self.load_time = time.time() - start
+        self.loaded_at = time.time()
+        self.stamp = stamp
+        self.version += 1
+        self.current = (lex_dict, maxlen, self.version)
+        if self.verbose:
+            print >>sys.stderr, 'Loaded lexicon dictionary \'%s\' version %d in %.2f s' % \
+                (self.filename, self.version, self.load_time)
+
+    def run(self):
+        prev = self.stamp
+        while not self.stop.wait(self.interval):
+            try:
+                stamp = self.file_stamp()
+                # Wait for the file to stop changing before loading it
+                if stamp != self.stamp and stamp == prev:
+                    self.load()
+                prev = stamp
+            except Exception, e:
+                print >>sys.stderr, 'Unable to reload lexicon dictionary \'%s\': %s' % \
+                    (self.filename, e)
+
+def read_lines(fd):
+    """Read lines from a file descriptor"""
+    buf = ''
+    while True:
+        data = os.read(fd, 65536)
+        if not data:
+            break
+        lines = (buf + data).split('\n')
+        buf = lines.pop()
+        for line in lines:
+            yield line
+    if buf:
+        yield buf
+
+def main():
+    dictname = 'lex_dict.p'
+    stats = {'lines' : 0, 'chars' : 0, 'started' : time.time()}
+
+    parser = argparse.ArgumentParser(description='Long running word segmenter')
+    parser.add_argument('-f', '--freq', action='store', dest='freq_threshold',
+                        type=int, default=1,
+                        help="minimum dictionary word frequency threshold \
+                        (default: 1)")
+    parser.add_argument('-i', '--interval', action='store', dest='interval',
+                        type=float, default=5.0,
+                        help="seconds between checks of the lexicon dictionary \
+                        file (default: 5)")
+    parser.add_argument('-l', '--lexdict', action='store', dest='lfilename',
+                        help="lexicon dictionary file")
+    parser.add_argument('-v', '--verbose', action='store_true', dest='verbose',
+                        help="enable verbose mode")
+    parser.add_argument('-w', '--width', action='store', dest='widthtype',
+                        type=int, default=1,
+                        help="space character type, e.g. ASCII space (1), ASCII \
+                        double space (2), ideographic space (3), default: 1")
+
+    args = parser.parse_args()
+    freq_threshold = args.freq_threshold
+    interval = args.interval
+    lfilename = args.lfilename
+    verbose = args.verbose
+    widthtype = args.widthtype
+
+    if lfilename:
+        dictname = lfilename
+
+    if widthtype == 3:
+        space = u'\u3000'
+    elif widthtype == 2:
+        space = u'\u0020' + u'\u0020'
+    else:
+        space = u'\u0020'
+
+    watcher = lexicon_watcher(dictname, interval, verbose)
+    watcher.start()
+
+    def print_stats(signum, frame):
+        lex_dict, maxlen, version = watcher.current
+        print >>sys.stderr, 'Lexicon dictionary:', dictname
+        print >>sys.stderr, 'Lexicon version:', version
+        print >>sys.stderr, 'Lexicon words:', len(lex_dict)
+        print >>sys.stderr, 'Lexicon loaded:', time.ctime(watcher.loaded_at),
+        print >>sys.stderr, ', load time:', format(watcher.load_time, '.2f'), 's'
+        print >>sys.stderr, 'Lines segmented:', stats['lines']
+        print >>sys.stderr, 'Characters segmented:', stats['chars']
+        print >>sys.stderr, 'Uptime:', format(time.time() - stats['started'], '.0f'), 's'
+
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGUSR1, print_stats)
+    # Restart reads and writes interrupted by SIGUSR1 rather than failing them
+    signal.siginterrupt(signal.SIGUSR1, False)
+
+    try:
+        for line in read_lines(sys.stdin.fileno()):
+            # Take the lexicon once per line, a reload only affects the next 
+            # line
+            lex_dict, maxlen, version = watcher.current
+            input = line.decode('utf-8', errors='ignore')
+            spans = maximum_match_spans(input, freq_threshold, lex_dict, maxlen)
+            sys.stdout.write(join_spans(input, spans, space).encode('utf-8') + '\n')
+            sys.stdout.flush()
+            stats['lines'] += 1
+            stats['chars'] += len(input)
+            lex_dict = None
+    finally:
+        watcher.stop.set()
+        watcher.join()
+
+    if verbose:
+        print_stats(None, None)
+
+if __name__ == '__main__':
+    sys.exit(main())